@@ -4,22 +4,102 @@ A RESTful API for managing a book library.
 """
 from typing import Optional
 from contextlib import asynccontextmanager, contextmanager
+import functools
+import hashlib
+import itertools
+import queue
 import sqlite3
+import threading
+import time
 import os
+import orjson
 import uvicorn
 
-from fastapi import FastAPI, HTTPException, status
+from anyio import to_thread
+
+from fastapi import Body, FastAPI, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     """Lifespan event handler for startup and shutdown events"""
-    # Startup: Initialize database
+    # Startup: Size the threadpool that runs the sync (database) endpoints
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # Initialize database and warm the connection pool
     init_db()
+    get_pool()
+    # Build lazily-created schemas now rather than on the first requests
+    warm_up(_app)
     yield
-    # Shutdown: Nothing to clean up for SQLite
+    # Shutdown: Close pooled connections
+    close_pools()
+
+
+HEALTH_STATUS = {"status": "healthy", "service": "library-api"}
+
+
+class HealthCheckMiddleware:
+    """ASGI middleware that answers GET /api/health before routing"""
+
+    body = orjson.dumps(HEALTH_STATUS)
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+
+    def __init__(self, asgi_app):
+        self.app = asgi_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/api/health" and scope["method"] == "GET":
+            await send({"type": "http.response.start", "status": 200, "headers": self.headers})
+            await send({"type": "http.response.body", "body": self.body})
+            return
+        await self.app(scope, receive, send)
+
+
+class ConditionalBookReadsMiddleware:
+    """ASGI middleware that tags book reads with an ETag and answers a matching If-None-Match with 304"""
+
+    def __init__(self, asgi_app):
+        self.app = asgi_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        book_id = path.removeprefix("/api/books/")
+        if path == "/api/books":
+            book_id = None
+        elif not (path.startswith("/api/books/") and book_id.isascii() and book_id.isdigit()):
+            await self.app(scope, receive, send)
+            return
+        try:
+            etag = await run_in_threadpool(books_etag, book_id, scope["query_string"])
+        except HTTPException:
+            await self.app(scope, receive, send)
+            return
+        headers = [(b"etag", etag.encode()), (b"cache-control", BOOKS_CACHE_CONTROL.encode())]
+        if_none_match = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == b"if-none-match"),
+            None
+        )
+        if etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": [*message["headers"], *headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
 
 
 # Initialize FastAPI app with lifespan
@@ -30,17 +110,75 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# CORS middleware for frontend communication
+
+# Book reads get ETags; registered first so CORS and the health check wrap it
+app.add_middleware(ConditionalBookReadsMiddleware)
+
+# Load-balancer probes skip routing and the ETag lookup
+app.add_middleware(HealthCheckMiddleware)
+
+# CORS middleware for frontend communication. Explicit methods and headers
+# give a fixed preflight response, and browsers may cache it for a day.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://localhost:4173", "http://localhost:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,
+)
+
+# Database path, resolved once to an absolute path so it does not depend on the cwd
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "databases", "library.db")
+
+# Applied to every new connection. WAL lets readers run alongside the writer and
+# synchronous=NORMAL skips the per-commit fsync (durability is kept at checkpoints).
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
 )
 
-# Database path
-DB_PATH = os.path.join(os.path.dirname(__file__), "databases", "library.db")
+# Connection pool sizing (reader connections; the writer is extra)
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 8
+POOL_IDLE_TIMEOUT = 300.0
+POOL_ACQUIRE_TIMEOUT = 5.0
+
+# Worker threads for the sync endpoints, which FastAPI runs off the event loop
+THREADPOOL_SIZE = 64
+
+# The trigram tokenizer can only match terms of at least three characters;
+# shorter filters, and terms with control characters such as NUL that an FTS
+# query string cannot hold, fall back to a LIKE scan
+FTS_MIN_TERM_LENGTH = 3
+
+# FTS column filter and LIKE fallback for the search, genre and author filters.
+# {n} is the filter's parameter number: the value is bound once, with % and _
+# escaped so they match literally as in FTS, and SQLite adds the wildcards.
+BOOK_FILTERS = (
+    (
+        "{title author}",
+        r"(title LIKE '%' || ?{n} || '%' ESCAPE '\' OR author LIKE '%' || ?{n} || '%' ESCAPE '\')"
+    ),
+    ("genre", r"genre LIKE '%' || ?{n} || '%' ESCAPE '\'"),
+    ("author", r"author LIKE '%' || ?{n} || '%' ESCAPE '\'"),
+)
+
+# Book reads may be cached but must be revalidated, so edits show up immediately
+BOOKS_CACHE_CONTROL = "no-cache"
+
+# Rows fetched and serialized per chunk when streaming the book list; a list
+# that fits in one batch is sent as a plain response instead
+STREAM_BATCH_SIZE = 200
+
+# Largest batch accepted by POST /api/books/bulk
+BULK_MAX_BOOKS = 1000
+
+# Prepared-statement capacity per connection; the app uses a few dozen statement shapes
+SQLITE_CACHED_STATEMENTS = 256
 
 
 # Pydantic models with validation
@@ -91,59 +229,451 @@ class ErrorResponse(BaseModel):
     detail: str
 
 
+def warm_up(application: FastAPI):
+    """Run each model's validator and serializer once and build the OpenAPI schema"""
+    BookCreate.model_validate({"title": "Warm-up", "author": "Warm-up"})
+    BookUpdate.model_validate({"title": "Warm-up"})
+    Book.model_validate({"id": 0, "title": "Warm-up", "author": "Warm-up"}).model_dump_json()
+    application.openapi()
+
+
+# Connection options shared by every pool; only the database path varies
+_CONNECT = functools.partial(
+    sqlite3.connect,
+    detect_types=0,
+    isolation_level=None,
+    check_same_thread=False,
+    cached_statements=SQLITE_CACHED_STATEMENTS,
+    uri=False,
+)
+
+
+def connect_db(path):
+    """Open a tuned SQLite connection in autocommit mode"""
+    conn = _CONNECT(path)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections for one database file.
+    
+    Readers are handed out from a queue so each connection keeps its page
+    cache between requests. Writes share a single connection behind a lock,
+    matching SQLite's one-writer-at-a-time model.
+    """
+
+    def __init__(self, path, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE,
+                 idle_timeout=POOL_IDLE_TIMEOUT):
+        self.path = path
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle = queue.LifoQueue()
+        self._size = 0
+        self._size_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._writer = None
+        for _ in range(min_size):
+            self._idle.put((connect_db(path), time.monotonic()))
+            self._size += 1
+
+    def acquire(self, timeout=POOL_ACQUIRE_TIMEOUT):
+        """Borrow a reader connection, raising queue.Empty if none frees up in time"""
+        while True:
+            try:
+                conn, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._size > self.min_size and time.monotonic() - released_at > self.idle_timeout:
+                self._discard(conn)
+                continue
+            return conn
+        with self._size_lock:
+            grow = self._size < self.max_size
+            if grow:
+                self._size += 1
+        if grow:
+            try:
+                return connect_db(self.path)
+            except sqlite3.Error:
+                with self._size_lock:
+                    self._size -= 1
+                raise
+        conn, _ = self._idle.get(timeout=timeout)
+        return conn
+
+    def release(self, conn):
+        """Return a reader connection to the pool"""
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def writer(self):
+        """Hold the shared writer connection for the duration of the block"""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = connect_db(self.path)
+            yield self._writer
+
+    def health(self):
+        """Snapshot of pool usage"""
+        idle = self._idle.qsize()
+        return {
+            "status": "healthy",
+            "size": self._size,
+            "idle": idle,
+            "in_use": self._size - idle,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "writer_busy": self._write_lock.locked(),
+        }
+
+    def close(self):
+        """Close every idle reader and the writer connection"""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _discard(self, conn):
+        conn.close()
+        with self._size_lock:
+            self._size -= 1
+
+
+_POOLS: dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool():
+    """Get the connection pool for the current database, creating it on first use"""
+    pool = _POOLS.get(DB_PATH)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(DB_PATH)
+            if pool is None:
+                pool = _POOLS[DB_PATH] = ConnectionPool(DB_PATH)
+    return pool
+
+
+def close_pools():
+    """Close all connection pools"""
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
+
+
 @contextmanager
-def get_db():
-    """Database connection context manager"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+def get_db(write=False):
+    """
+    Database connection context manager.
+    
+    Borrows a reader from the pool, or the shared writer when write=True.
+    """
+    pool = get_pool()
+    if write:
+        with pool.writer() as conn:
+            yield conn
+        return
+    try:
+        conn = pool.acquire()
+    except queue.Empty as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is busy, please retry"
+        ) from exc
     try:
         yield conn
     finally:
-        conn.close()
+        pool.release(conn)
 
 
-def to_native(value):
-    """Convert Pydantic types to native Python types for SQLite"""
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return str(value)
-    if isinstance(value, int):
-        return int(value)
-    if isinstance(value, float):
-        return float(value)
-    if isinstance(value, bool):
-        return bool(value)
-    return value
+@contextmanager
+def write_transaction(conn):
+    """Run the enclosed writes in a single BEGIN IMMEDIATE ... COMMIT block"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        # SQLite may already have rolled back by itself (e.g. SQLITE_FULL);
+        # rolling back again would raise and hide the original error
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+# Bump SCHEMA_VERSION when SCHEMA_SQL changes so existing databases pick it up
+SCHEMA_VERSION = 1
+
+# Lock wait allowed while one worker builds the schema and the others queue up
+SCHEMA_BUSY_TIMEOUT_MS = 60000
+
+# The whole schema in one script and one transaction. Every statement is
+# idempotent, so it also upgrades databases created by older versions.
+# Workers starting together may all read an old user_version before one of
+# them takes the write lock, so the expensive FTS rebuild re-checks the
+# version inside the transaction and only runs once.
+SCHEMA_SQL = f"""
+BEGIN IMMEDIATE;
+
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    isbn TEXT,
+    year INTEGER,
+    genre TEXT
+);
+
+-- Lets the title-ordered listing walk the index instead of sorting
+CREATE INDEX IF NOT EXISTS idx_books_title ON books(title);
+
+-- Trigram index over the searchable columns, kept in sync by triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    title, author, genre,
+    content='books', content_rowid='id', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts(rowid, title, author, genre)
+    VALUES (new.id, new.title, new.author, new.genre);
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts(books_fts, rowid, title, author, genre)
+    VALUES ('delete', old.id, old.title, old.author, old.genre);
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE ON books BEGIN
+    INSERT INTO books_fts(books_fts, rowid, title, author, genre)
+    VALUES ('delete', old.id, old.title, old.author, old.genre);
+    INSERT INTO books_fts(rowid, title, author, genre)
+    VALUES (new.id, new.title, new.author, new.genre);
+END;
+
+-- Index books that were stored before the search table existed
+INSERT INTO books_fts(books_fts)
+SELECT 'rebuild' WHERE (SELECT user_version FROM pragma_user_version) < {SCHEMA_VERSION};
+
+-- Single-row counter bumped on every book write; backs the ETags.
+-- The random token keeps tags unique if the database is recreated.
+CREATE TABLE IF NOT EXISTS books_revision (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    token TEXT NOT NULL DEFAULT (lower(hex(randomblob(8)))),
+    revision INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO books_revision (id) VALUES (1);
+
+CREATE TRIGGER IF NOT EXISTS books_revision_insert AFTER INSERT ON books BEGIN
+    UPDATE books_revision SET revision = revision + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_revision_update AFTER UPDATE ON books BEGIN
+    UPDATE books_revision SET revision = revision + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_revision_delete AFTER DELETE ON books BEGIN
+    UPDATE books_revision SET revision = revision + 1;
+END;
+
+PRAGMA user_version = {SCHEMA_VERSION};
+
+COMMIT;
+"""
 
 
 def init_db():
-    """Initialize the database with the books table"""
+    """Initialize the database schema unless it is already up to date"""
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    with get_db(write=True) as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+            conn.execute(f"PRAGMA busy_timeout = {SCHEMA_BUSY_TIMEOUT_MS}")
+            try:
+                conn.executescript(SCHEMA_SQL)
+            except sqlite3.Error:
+                # Don't leave the shared writer stuck inside the failed transaction
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.execute(f"PRAGMA busy_timeout = {busy_timeout}")
+
+
+def fts_phrase(columns, term):
+    """Build an FTS5 query matching the literal term anywhere in the given columns"""
+    escaped = term.replace('"', '""')
+    return f'{columns} : "{escaped}"'
+
+
+def like_literal(term):
+    """Escape LIKE wildcards so the term matches literally under ESCAPE '\\'"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Rows are plain tuples in Book field order; book_row() turns one into a dict
+BOOK_COLUMNS = ("id", "title", "author", "isbn", "year", "genre")
+BOOK_COLUMNS_SQL = ", ".join(BOOK_COLUMNS)
+
+INSERT_SQL = "INSERT INTO books (title, author, isbn, year, genre) VALUES (?, ?, ?, ?, ?)"
+
+
+def book_row(row):
+    """Map a books row tuple to a dict keyed by Book field name"""
+    return dict(zip(BOOK_COLUMNS, row))
+
+
+def book_params(book):
+    """INSERT_SQL parameters for a new book"""
+    return (book.title, book.author, book.isbn, book.year, book.genre)
+
+
+def books_etag(book_id=None, query_string=b""):
+    """
+    Current ETag for the book list, or for one book when book_id is given.
+    
+    It changes whenever any book is written. A single book's tag includes its
+    id and the list's tag a digest of the filter query string, so one URL's tag
+    never validates another.
+    """
     with get_db() as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS books (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                author TEXT NOT NULL,
-                isbn TEXT,
-                year INTEGER,
-                genre TEXT
-            )
-        """)
-        conn.commit()
+        token, revision = conn.execute("SELECT token, revision FROM books_revision").fetchone()
+    if book_id is not None:
+        return f'"{token}-{revision}-{book_id}"'
+    if not query_string:
+        return f'"{token}-{revision}"'
+    query_digest = hashlib.blake2b(query_string, digest_size=8).hexdigest()
+    return f'"{token}-{revision}-q{query_digest}"'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Check an If-None-Match header value against an ETag.
+    
+    "*" is not honoured: the tag lookup runs before the handler knows whether
+    the book exists, and "*" must not match a missing representation.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def filter_mode(value):
+    """Classify a filter value: None if unused, else "fts", or "like" when FTS can't take it"""
+    if not value:
+        return None
+    return "fts" if len(value) >= FTS_MIN_TERM_LENGTH and value.isprintable() else "like"
+
+
+def build_books_query(modes):
+    """SQL and parameter builder for the book listing with the given filter modes"""
+    clauses = []
+    like_slots = []
+    fts_slots = []
+    for slot, ((columns, like), mode) in enumerate(zip(BOOK_FILTERS, modes)):
+        if mode == "like":
+            like_slots.append(slot)
+            clauses.append(like.format(n=len(like_slots)))
+        elif mode == "fts":
+            fts_slots.append((slot, columns))
+    if fts_slots:
+        clauses.append(
+            f"id IN (SELECT rowid FROM books_fts WHERE books_fts MATCH ?{len(like_slots) + 1})"
+        )
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    query = f"SELECT {BOOK_COLUMNS_SQL} FROM books{where} ORDER BY title ASC"
+
+    def build_params(values):
+        params = [like_literal(values[slot]) for slot in like_slots]
+        if fts_slots:
+            params.append(" AND ".join(fts_phrase(columns, values[slot]) for slot, columns in fts_slots))
+        return params
+
+    return query, build_params
+
+
+# Every listing shape (each filter unused, indexed or LIKE: 27 in all) is built
+# at import time, so requests only do a dict lookup and reuse the same SQL
+# strings, which keeps sqlite3's per-connection statement cache hitting
+BOOKS_QUERIES = {
+    modes: build_books_query(modes)
+    for modes in itertools.product((None, "fts", "like"), repeat=len(BOOK_FILTERS))
+}
+
+
+def build_update_statement(fields):
+    """SQL updating the given columns of one book and returning the new row"""
+    if not fields:
+        return f"SELECT {BOOK_COLUMNS_SQL} FROM books WHERE id = ?"
+    assignments = ", ".join(f"{field} = ?" for field in fields)
+    return f"UPDATE books SET {assignments} WHERE id = ? RETURNING {BOOK_COLUMNS_SQL}"
+
+
+# Columns a BookUpdate may change, in the order their parameters are bound
+UPDATE_FIELDS = ("title", "author", "isbn", "year", "genre")
+
+# One statement per subset of UPDATE_FIELDS (the empty subset just reads the
+# book), keyed by the subset in UPDATE_FIELDS order
+UPDATE_SQLS = {
+    fields: build_update_statement(fields)
+    for size in range(len(UPDATE_FIELDS) + 1)
+    for fields in itertools.combinations(UPDATE_FIELDS, size)
+}
+
+
+def stream_books(query, params):
+    """
+    Yield the matching books as one JSON array, a fetchmany() batch per chunk.
+    
+    The first chunk opens the array and only the last one closes it, so a
+    chunk ending in "]" means the list is complete. While the stream is open
+    it holds a pooled reader (and its WAL snapshot), so a slow client ties up
+    one of the POOL_MAX_SIZE connections until it has read the whole list.
+    """
+    with get_db() as conn:
+        cursor = conn.execute(query, params)
+        batch = cursor.fetchmany(STREAM_BATCH_SIZE)
+        prefix = b"["
+        while True:
+            next_batch = cursor.fetchmany(STREAM_BATCH_SIZE) if len(batch) == STREAM_BATCH_SIZE else []
+            # Each batch is encoded as an array; drop its brackets to splice it in
+            body = orjson.dumps([book_row(row) for row in batch])[1:-1]
+            if not next_batch:
+                yield prefix + body + b"]"
+                return
+            yield prefix + body
+            prefix = b","
+            batch = next_batch
 
 
 # API Endpoints
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "library-api"}
+    """Health check endpoint (GET is answered by HealthCheckMiddleware; kept for the API docs)"""
+    return HEALTH_STATUS
 
 
-@app.get("/api/books", response_model=list[Book])
-async def get_books(
+@app.get("/api/pool-health")
+async def pool_health():
+    """Connection pool usage for the current database"""
+    return get_pool().health()
+
+
+@app.get("/api/books", response_model=None, responses={200: {"model": list[Book]}})
+def get_books(
     search: Optional[str] = None,
     genre: Optional[str] = None,
     author: Optional[str] = None
@@ -155,40 +685,37 @@ async def get_books(
     - **genre**: Filter by genre
     - **author**: Filter by author name
     """
-    with get_db() as conn:
-        query = "SELECT * FROM books WHERE 1=1"
-        params = []
-        if search:
-            query += " AND (title LIKE ? OR author LIKE ?)"
-            params.extend([f"%{search}%", f"%{search}%"])
-        if genre:
-            query += " AND genre LIKE ?"
-            params.append(f"%{genre}%")
-        if author:
-            query += " AND author LIKE ?"
-            params.append(f"%{author}%")
-        query += " ORDER BY title ASC"
-        cursor = conn.execute(query, params)
-        books = [dict(row) for row in cursor.fetchall()]
-        return books
-
-
-@app.get("/api/books/{book_id}", response_model=Book, responses={404: {"model": ErrorResponse}})
-async def get_book(book_id: int):
+    filters = (search, genre, author)
+    query, build_params = BOOKS_QUERIES[tuple(filter_mode(value) for value in filters)]
+    # Rows come straight from our own table, so skip re-validating them as Book
+    # models, and stream large lists instead of building them in memory
+    chunks = stream_books(query, build_params(filters))
+    # Run the query now so pool or SQL errors still turn into an error response
+    first_chunk = next(chunks)
+    if first_chunk.endswith(b"]"):
+        # Everything fit in one batch: release the reader and skip streaming
+        chunks.close()
+        return Response(content=first_chunk, media_type="application/json")
+    return StreamingResponse(itertools.chain((first_chunk,), chunks), media_type="application/json")
+
+
+@app.get("/api/books/{book_id}", response_model=None,
+         responses={200: {"model": Book}, 404: {"model": ErrorResponse}})
+def get_book(book_id: int):
     """Get a specific book by ID"""
     with get_db() as conn:
-        cursor = conn.execute("SELECT * FROM books WHERE id = ?", (book_id,))
+        cursor = conn.execute(f"SELECT {BOOK_COLUMNS_SQL} FROM books WHERE id = ?", (book_id,))
         book = cursor.fetchone()
         if not book:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Book with ID {book_id} not found"
             )
-        return dict(book)
+    return Response(content=orjson.dumps(book_row(book)), media_type="application/json")
 
 
 @app.post("/api/books", response_model=Book, status_code=status.HTTP_201_CREATED)
-async def create_book(book: BookCreate):
+def create_book(book: BookCreate):
     """
     Create a new book.
     
@@ -198,72 +725,78 @@ async def create_book(book: BookCreate):
     - **year**: Optional publication year (1000-2100)
     - **genre**: Optional genre
     """
-    with get_db() as conn:
-        cursor = conn.execute(
-            """
-            INSERT INTO books (title, author, isbn, year, genre)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (to_native(book.title), to_native(book.author), to_native(book.isbn),
-             to_native(book.year), to_native(book.genre))        )
-        conn.commit()
-        # Fetch the created book
-        new_book = conn.execute(
-            "SELECT * FROM books WHERE id = ?", (cursor.lastrowid,)
-        ).fetchone()
-        return dict(new_book)
+    with get_db(write=True) as conn, write_transaction(conn):
+        new_book = conn.execute(f"{INSERT_SQL} RETURNING {BOOK_COLUMNS_SQL}", book_params(book)).fetchone()
+    return book_row(new_book)
+
+
+@app.post("/api/books/bulk", response_model=list[Book], status_code=status.HTTP_201_CREATED)
+def create_books(books: list[BookCreate] = Body(..., max_length=BULK_MAX_BOOKS)):
+    """
+    Create several books in one transaction.
+    
+    Accepts up to BULK_MAX_BOOKS books with the same fields as POST /api/books.
+    """
+    if not books:
+        return []
+    with get_db(write=True) as conn, write_transaction(conn):
+        conn.executemany(INSERT_SQL, [book_params(book) for book in books])
+        # The writer lock and BEGIN IMMEDIATE mean the new ids are consecutive
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        new_books = conn.execute(
+            f"SELECT {BOOK_COLUMNS_SQL} FROM books WHERE id BETWEEN ? AND ? ORDER BY id",
+            (last_id - len(books) + 1, last_id)
+        ).fetchall()
+    return [book_row(row) for row in new_books]
 
 
 @app.put("/api/books/{book_id}", response_model=Book, responses={404: {"model": ErrorResponse}})
-async def update_book(book_id: int, book: BookUpdate):
+def update_book(book_id: int, book: BookUpdate):
     """
     Update an existing book.
     
     Only provided fields will be updated.
     """
-    with get_db() as conn:
-        # Check if book exists
-        existing = conn.execute("SELECT * FROM books WHERE id = ?", (book_id,)).fetchone()
-        if not existing:
+    with get_db(write=True) as conn, write_transaction(conn):
+        # Fields left out of the request (or sent as null) keep their value
+        changes = [(field, getattr(book, field)) for field in UPDATE_FIELDS]
+        changes = [(field, value) for field, value in changes if value is not None]
+        query = UPDATE_SQLS[tuple(field for field, _ in changes)]
+        params = [value for _, value in changes]
+        params.append(book_id)
+        updated_book = conn.execute(query, params).fetchone()
+        if not updated_book:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Book with ID {book_id} not found"
             )
-            # Build update query dynamically
-        updates = []
-        params = []
-        update_data = book.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if value is not None:
-                updates.append(f"{field} = ?")
-                params.append(to_native(value))
-        if updates:
-            params.append(book_id)
-            query = f"UPDATE books SET {', '.join(updates)} WHERE id = ?"
-            conn.execute(query, params)
-            conn.commit()
-        # Return updated book
-        updated_book = conn.execute("SELECT * FROM books WHERE id = ?", (book_id,)).fetchone()
-        return dict(updated_book)
+    return book_row(updated_book)
 
 
 @app.delete("/api/books/{book_id}", status_code=status.HTTP_204_NO_CONTENT, responses={404: {"model": ErrorResponse}})
-async def delete_book(book_id: int):
+def delete_book(book_id: int):
     """Delete a book by ID"""
-    with get_db() as conn:
-        # Check if book exists
-        existing = conn.execute("SELECT * FROM books WHERE id = ?", (book_id,)).fetchone()
-        if not existing:
+    with get_db(write=True) as conn, write_transaction(conn):
+        deleted = conn.execute("DELETE FROM books WHERE id = ? RETURNING id", (book_id,)).fetchone()
+        if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Book with ID {book_id} not found"
             )
-        conn.execute("DELETE FROM books WHERE id = ?", (book_id,))
-        conn.commit()
-        return None
 
 
 # Run with: uvicorn backend.main:app --reload
+# Running this file starts one worker per core (2 * CPUs + 1, or WEB_CONCURRENCY).
+# Each worker opens its own connection pool; WAL keeps their writes safe.
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "backend.main:app",
+        app_dir=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", str((os.cpu_count() or 1) * 2 + 1))),
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
     
\ No newline at end of file
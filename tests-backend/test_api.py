@@ -23,24 +23,12 @@ def setup_test_db(tmp_path):
     main_module.DB_PATH = test_db
     
     # Initialize database
-    os.makedirs(os.path.dirname(test_db), exist_ok=True)
-    conn = sqlite3.connect(test_db)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS books (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            author TEXT NOT NULL,
-            isbn TEXT,
-            year INTEGER,
-            genre TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
+    init_db()
     
     yield
     
     # Cleanup
+    main_module.close_pools()
     if os.path.exists(test_db):
         os.remove(test_db)
 
@@ -51,6 +39,19 @@ def client():
     return TestClient(app)
 
 
+class TestLifespan:
+    """Tests for application startup and shutdown"""
+    
+    def test_startup_prepares_database_and_schema(self):
+        import main as main_module
+        main_module.app.openapi_schema = None
+        with TestClient(app) as lifespan_client:
+            assert lifespan_client.get("/api/books").status_code == 200
+            assert main_module.app.openapi_schema is not None
+            assert main_module.DB_PATH in main_module._POOLS
+        assert main_module._POOLS == {}
+
+
 class TestHealthEndpoint:
     """Tests for the health check endpoint"""
     
@@ -67,6 +68,36 @@ class TestHealthEndpoint:
         response = client.get("/api/health")
         data = response.json()
         assert data["service"] == "library-api"
+    
+    def test_health_returns_json_content_type(self, client):
+        response = client.get("/api/health")
+        assert response.headers["content-type"] == "application/json"
+    
+    def test_health_rejects_other_methods(self, client):
+        response = client.post("/api/health")
+        assert response.status_code == 405
+
+
+class TestCors:
+    """Tests for CORS preflight handling"""
+    
+    def test_preflight_from_frontend_origin(self, client):
+        response = client.options("/api/books", headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type",
+        })
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+        assert "PUT" in response.headers["access-control-allow-methods"]
+        assert response.headers["access-control-max-age"] == "86400"
+    
+    def test_preflight_rejects_unlisted_method(self, client):
+        response = client.options("/api/books", headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "PATCH",
+        })
+        assert response.status_code == 400
 
 
 class TestGetBooks:
@@ -88,6 +119,41 @@ class TestGetBooks:
         assert response.status_code == 200
         assert len(response.json()) == 1
     
+    def test_get_books_streams_large_library(self, client):
+        import main as main_module
+        with main_module.get_db(write=True) as conn, main_module.write_transaction(conn):
+            conn.executemany(
+                "INSERT INTO books (title, author) VALUES (?, ?)",
+                [(f"Book {i:04d}", "Author") for i in range(main_module.STREAM_BATCH_SIZE * 2 + 50)]
+            )
+        
+        response = client.get("/api/books")
+        assert response.status_code == 200
+        titles = [b["title"] for b in response.json()]
+        assert len(titles) == main_module.STREAM_BATCH_SIZE * 2 + 50
+        assert titles == sorted(titles)
+        assert main_module.get_pool().health()["in_use"] == 0
+    
+    def test_get_books_full_batch_is_streamed_as_valid_json(self, client):
+        import main as main_module
+        with main_module.get_db(write=True) as conn, main_module.write_transaction(conn):
+            conn.executemany(
+                "INSERT INTO books (title, author) VALUES (?, ?)",
+                [(f"Book {i:04d}", "Author") for i in range(main_module.STREAM_BATCH_SIZE)]
+            )
+        
+        response = client.get("/api/books")
+        assert len(response.json()) == main_module.STREAM_BATCH_SIZE
+        assert main_module.get_pool().health()["in_use"] == 0
+    
+    def test_get_books_small_list_is_not_streamed(self, client):
+        import main as main_module
+        client.post("/api/books", json={"title": "Only", "author": "Author"})
+        
+        response = client.get("/api/books")
+        assert response.headers["content-length"] == str(len(response.content))
+        assert main_module.get_pool().health()["in_use"] == 0
+    
     def test_get_books_with_search_filter(self, client):
         # Create books
         client.post("/api/books", json={"title": "Python Guide", "author": "John"})
@@ -98,6 +164,124 @@ class TestGetBooks:
         books = response.json()
         assert len(books) == 1
         assert books[0]["title"] == "Python Guide"
+    
+    def test_search_is_case_insensitive_substring(self, client):
+        client.post("/api/books", json={"title": "Python Guide", "author": "John"})
+        client.post("/api/books", json={"title": "Java Guide", "author": "Jane"})
+        
+        response = client.get("/api/books?search=UIDE")
+        assert [b["title"] for b in response.json()] == ["Java Guide", "Python Guide"]
+    
+    def test_short_search_term_still_matches(self, client):
+        client.post("/api/books", json={"title": "Python Guide", "author": "John"})
+        client.post("/api/books", json={"title": "Java Guide", "author": "Jane"})
+        
+        response = client.get("/api/books?search=Py")
+        assert [b["title"] for b in response.json()] == ["Python Guide"]
+    
+    def test_search_with_quotes_does_not_fail(self, client):
+        client.post("/api/books", json={"title": 'The "Best" Book', "author": "John"})
+        
+        response = client.get('/api/books?search="Best"')
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+    
+    def test_filters_with_nul_byte_do_not_fail(self, client):
+        client.post("/api/books", json={"title": "Book", "author": "Author", "genre": "Fiction"})
+        
+        for query in ("search=ab%00c", "genre=Fic%00", "author=x%00yz"):
+            response = client.get(f"/api/books?{query}")
+            assert response.status_code == 200
+            assert response.json() == []
+    
+    def test_search_wildcards_match_literally(self, client):
+        client.post("/api/books", json={"title": "aXb", "author": "Author"})
+        client.post("/api/books", json={"title": "100% Done", "author": "Author"})
+        
+        for term, titles in (("%", ["100% Done"]), ("_", []), ("a%b", []), ("0% D", ["100% Done"])):
+            response = client.get("/api/books", params={"search": term})
+            assert [b["title"] for b in response.json()] == titles
+    
+    def test_get_books_with_genre_and_author_filters(self, client):
+        client.post("/api/books", json={"title": "A", "author": "Jane Doe", "genre": "Updated Genre"})
+        client.post("/api/books", json={"title": "B", "author": "John Roe", "genre": "Updated Genre"})
+        client.post("/api/books", json={"title": "C", "author": "Jane Doe", "genre": "Fiction"})
+        
+        response = client.get("/api/books?genre=Updated&author=jane")
+        assert [b["title"] for b in response.json()] == ["A"]
+    
+    def test_short_filters_combined_with_indexed_filter(self, client):
+        client.post("/api/books", json={"title": "Go Tips", "author": "Jane Doe", "genre": "IT"})
+        client.post("/api/books", json={"title": "Go Tips", "author": "John Roe", "genre": "IT"})
+        client.post("/api/books", json={"title": "Java Tips", "author": "Jane Doe", "genre": "Art"})
+        
+        response = client.get("/api/books?search=Go&genre=it&author=jane")
+        books = response.json()
+        assert len(books) == 1
+        assert books[0]["author"] == "Jane Doe"
+    
+    def test_search_reflects_updates_and_deletes(self, client):
+        book_id = client.post("/api/books", json={"title": "Old Name", "author": "John"}).json()["id"]
+        client.put(f"/api/books/{book_id}", json={"title": "New Name"})
+        
+        assert client.get("/api/books?search=Old").json() == []
+        assert len(client.get("/api/books?search=New").json()) == 1
+        
+        client.delete(f"/api/books/{book_id}")
+        assert client.get("/api/books?search=New").json() == []
+
+
+class TestConditionalGet:
+    """Tests for ETag handling on book reads"""
+    
+    def test_get_books_sends_etag(self, client):
+        response = client.get("/api/books")
+        assert response.headers["etag"]
+        assert response.headers["cache-control"] == "no-cache"
+    
+    def test_matching_etag_returns_304(self, client):
+        book_id = client.post("/api/books", json={"title": "Cached", "author": "Author"}).json()["id"]
+        for url in ("/api/books", f"/api/books/{book_id}"):
+            etag = client.get(url).headers["etag"]
+            response = client.get(url, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.headers["etag"] == etag
+    
+    def test_write_changes_etag(self, client):
+        etag = client.get("/api/books").headers["etag"]
+        client.post("/api/books", json={"title": "New", "author": "Author"})
+        
+        response = client.get("/api/books", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert len(response.json()) == 1
+    
+    def test_star_does_not_hide_missing_book(self, client):
+        response = client.get("/api/books/99999", headers={"If-None-Match": "*"})
+        assert response.status_code == 404
+    
+    def test_etag_from_another_url_does_not_match(self, client):
+        book_id = client.post("/api/books", json={"title": "Tagged", "author": "Author"}).json()["id"]
+        list_etag = client.get("/api/books").headers["etag"]
+        book_etag = client.get(f"/api/books/{book_id}").headers["etag"]
+        
+        assert client.get("/api/books/99999", headers={"If-None-Match": book_etag}).status_code == 404
+        assert client.get("/api/books/99999", headers={"If-None-Match": list_etag}).status_code == 404
+    
+    def test_list_etag_depends_on_filters(self, client):
+        client.post("/api/books", json={"title": "Über Alles", "author": "Author"})
+        etag = client.get("/api/books?search=Über").headers["etag"]
+        
+        response = client.get("/api/books?search=zzz", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json() == []
+        assert client.get("/api/books", headers={"If-None-Match": etag}).status_code == 200
+        assert client.get("/api/books?search=Über", headers={"If-None-Match": etag}).status_code == 304
+    
+    def test_missing_book_has_no_etag(self, client):
+        response = client.get("/api/books/99999")
+        assert response.status_code == 404
+        assert "etag" not in response.headers
 
 
 class TestCreateBook:
@@ -155,6 +339,36 @@ class TestCreateBook:
         assert response.status_code == 422
 
 
+class TestBulkCreateBooks:
+    """Tests for POST /api/books/bulk endpoint"""
+    
+    def test_bulk_create_returns_books_in_order(self, client):
+        response = client.post("/api/books/bulk", json=[
+            {"title": "First", "author": "Author A"},
+            {"title": "Second", "author": "Author B", "year": 2020},
+        ])
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert [b["title"] for b in data] == ["First", "Second"]
+        assert data[1]["year"] == 2020
+        assert len(client.get("/api/books").json()) == 2
+    
+    def test_bulk_create_with_empty_list(self, client):
+        response = client.post("/api/books/bulk", json=[])
+        assert response.status_code == 201
+        assert response.json() == []
+    
+    def test_bulk_create_rejects_whole_batch_on_invalid_book(self, client):
+        response = client.post("/api/books/bulk", json=[
+            {"title": "Valid", "author": "Author"},
+            {"title": "", "author": "Author"},
+        ])
+        
+        assert response.status_code == 422
+        assert client.get("/api/books").json() == []
+
+
 class TestGetSingleBook:
     """Tests for GET /api/books/{id} endpoint"""
     
@@ -170,6 +384,19 @@ class TestGetSingleBook:
         assert response.status_code == 200
         assert response.json()["title"] == "Test Book"
     
+    def test_get_book_sees_external_write(self, client):
+        import main as main_module
+        book_id = client.post("/api/books", json={"title": "Before", "author": "Author"}).json()["id"]
+        client.get(f"/api/books/{book_id}")
+        
+        # Simulate a write made by another worker process
+        conn = sqlite3.connect(main_module.DB_PATH)
+        conn.execute("UPDATE books SET title = 'Elsewhere' WHERE id = ?", (book_id,))
+        conn.commit()
+        conn.close()
+        
+        assert client.get(f"/api/books/{book_id}").json()["title"] == "Elsewhere"
+    
     def test_get_nonexistent_book_returns_404(self, client):
         response = client.get("/api/books/99999")
         assert response.status_code == 404
@@ -215,6 +442,31 @@ class TestUpdateBook:
         assert data["genre"] == "New Genre"
         assert data["year"] == 2025
     
+    def test_update_ignores_null_fields(self, client):
+        create_response = client.post("/api/books", json={
+            "title": "Keep Genre",
+            "author": "Test Author",
+            "genre": "Fiction"
+        })
+        book_id = create_response.json()["id"]
+        
+        response = client.put(f"/api/books/{book_id}", json={"genre": None, "isbn": "123"})
+        assert response.status_code == 200
+        assert response.json()["genre"] == "Fiction"
+        assert response.json()["isbn"] == "123"
+    
+    def test_update_with_no_fields_returns_book_unchanged(self, client):
+        create_response = client.post("/api/books", json={
+            "title": "Unchanged",
+            "author": "Test Author"
+        })
+        book_id = create_response.json()["id"]
+        
+        response = client.put(f"/api/books/{book_id}", json={})
+        assert response.status_code == 200
+        assert response.json() == create_response.json()
+        assert client.put("/api/books/99999", json={}).status_code == 404
+    
     def test_update_nonexistent_book_returns_404(self, client):
         response = client.put("/api/books/99999", json={
             "title": "Will Not Work"
@@ -277,3 +529,122 @@ class TestInputValidation:
             "year": 2101
         })
         assert response.status_code == 422
+
+
+class TestDatabase:
+    """Tests for the SQLite database setup"""
+    
+    def test_connection_uses_wal_journal(self):
+        import main as main_module
+        with main_module.get_db() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+    
+    def test_failed_write_is_rolled_back(self):
+        import main as main_module
+        with main_module.get_db(write=True) as conn:
+            with pytest.raises(sqlite3.IntegrityError):
+                with main_module.write_transaction(conn):
+                    conn.execute("INSERT INTO books (title, author) VALUES ('Kept?', 'Nobody')")
+                    conn.execute("INSERT INTO books (title) VALUES ('Missing author')")
+            count = conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+        assert count == 0
+    
+    def test_failed_commit_leaves_writer_usable(self, client):
+        import main as main_module
+        with main_module.get_db(write=True) as conn:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("CREATE TABLE parents (id INTEGER PRIMARY KEY)")
+            conn.execute("""
+                CREATE TABLE children (
+                    parent_id INTEGER REFERENCES parents(id) DEFERRABLE INITIALLY DEFERRED
+                )
+            """)
+            # The deferred foreign key is only checked, and fails, at COMMIT
+            with pytest.raises(sqlite3.IntegrityError):
+                with main_module.write_transaction(conn):
+                    conn.execute("INSERT INTO children (parent_id) VALUES (1)")
+            assert not conn.in_transaction
+            conn.execute("PRAGMA foreign_keys = OFF")
+        
+        response = client.post("/api/books", json={"title": "After Failure", "author": "Author"})
+        assert response.status_code == 201
+    
+    def test_book_listing_uses_title_index(self):
+        import main as main_module
+        with main_module.get_db() as conn:
+            plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM books ORDER BY title ASC").fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "idx_books_title" in details
+        assert "TEMP B-TREE" not in details
+    
+    def test_init_db_records_schema_version(self):
+        import main as main_module
+        with main_module.get_db() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        assert version == main_module.SCHEMA_VERSION
+        # Running again on an initialized database is a no-op
+        init_db()
+    
+    def test_schema_script_skips_rebuild_once_initialized(self):
+        import main as main_module
+        # A worker that read the old user_version before another worker
+        # finished initializing still runs the script; it must be a no-op
+        with main_module.get_db(write=True) as conn:
+            changes = conn.total_changes
+            conn.executescript(main_module.SCHEMA_SQL)
+            assert conn.total_changes == changes
+    
+    def test_init_db_indexes_existing_books(self, tmp_path, client):
+        import main as main_module
+        legacy_db = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("""
+            CREATE TABLE books (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                author TEXT NOT NULL,
+                isbn TEXT,
+                year INTEGER,
+                genre TEXT
+            )
+        """)
+        conn.execute("INSERT INTO books (title, author) VALUES ('Legacy Book', 'Old Author')")
+        conn.commit()
+        conn.close()
+        
+        main_module.DB_PATH = legacy_db
+        init_db()
+        response = client.get("/api/books?search=Legacy")
+        assert [b["title"] for b in response.json()] == ["Legacy Book"]
+
+
+class TestConnectionPool:
+    """Tests for the SQLite connection pool"""
+    
+    def test_reader_connection_is_reused(self):
+        import main as main_module
+        with main_module.get_db() as first:
+            pass
+        with main_module.get_db() as second:
+            pass
+        assert first is second
+    
+    def test_pool_does_not_grow_past_max_size(self, tmp_path):
+        import main as main_module
+        pool = main_module.ConnectionPool(str(tmp_path / "pool.db"), min_size=1, max_size=2)
+        held = [pool.acquire(), pool.acquire()]
+        with pytest.raises(main_module.queue.Empty):
+            pool.acquire(timeout=0.01)
+        for conn in held:
+            pool.release(conn)
+        pool.close()
+        assert pool.health()["size"] == 0
+    
+    def test_pool_health_endpoint(self, client):
+        response = client.get("/api/pool-health")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert data["in_use"] == 0
+        assert data["size"] <= data["max_size"]